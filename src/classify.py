@@ -17,9 +17,11 @@ import logging
 import asyncio
 import aiohttp
 import re
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, Mapping
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import yaml
+from .config import load_config
+from .file_utils import file_lock, write_atomic
+from .json_utils import json_loads, json_dumps
 
 
 class AIClassifier:
@@ -47,7 +49,7 @@ class AIClassifier:
         self.categories = self.config['categories']
         self.classification_prompt = self._build_classification_prompt()
         
-    def _load_config(self, config_path: str) -> Dict[str, Any]:
+    def _load_config(self, config_path: str) -> Mapping[str, Any]:
         """加载配置文件
         
         Args:
@@ -56,13 +58,7 @@ class AIClassifier:
         Returns:
             配置字典
         """
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Configuration file not found: {config_path}")
-        except yaml.YAMLError as e:
-            raise ValueError(f"Invalid YAML configuration: {e}")
+        return load_config(config_path)
     
     def _setup_logger(self) -> logging.Logger:
         """设置日志记录器
@@ -527,31 +523,32 @@ def main():
             print("请先运行 fetch_stars.py 获取GitHub Star数据")
             sys.exit(1)
         
-        # 加载数据
-        with open(data_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        repos = data.get('repositories', [])
-        
-        if not repos:
-            print("数据文件中没有找到仓库数据")
-            sys.exit(1)
-        
-        print(f"加载了 {len(repos)} 个仓库")
-        
-        # 初始化分类器
-        classifier = AIClassifier(config_path=args.config)
-        
-        # 执行分类
-        print("开始AI分类...")
-        updated_repos = classifier.update_repositories_with_classification(repos)
-        
-        # 更新数据
-        data['repositories'] = updated_repos
-        
-        # 保存结果
-        with open(data_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # 持有文件锁完成读取、分类和写入，避免与其他步骤并发修改数据文件互相覆盖
+        with file_lock(data_file):
+            # 加载数据
+            with open(data_file, 'rb') as f:
+                data = json_loads(f.read())
+            
+            repos = data.get('repositories', [])
+            
+            if not repos:
+                print("数据文件中没有找到仓库数据")
+                sys.exit(1)
+            
+            print(f"加载了 {len(repos)} 个仓库")
+            
+            # 初始化分类器
+            classifier = AIClassifier(config_path=args.config)
+            
+            # 执行分类
+            print("开始AI分类...")
+            updated_repos = classifier.update_repositories_with_classification(repos)
+            
+            # 更新数据
+            data['repositories'] = updated_repos
+            
+            # 保存结果
+            write_atomic(data_file, json_dumps(data, indent=True))
         
         classified_count = sum(1 for repo in updated_repos if repo.get('is_classified', False))
         print(f"分类完成: {classified_count}/{len(updated_repos)} 个仓库已分类")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GitHub Star Manager - 配置加载模块
+
+功能：
+- 统一加载 config.yaml，供各模块共享
+- 优先使用libyaml提供的CSafeLoader解析
+- 文件未修改时在进程内只解析一次，返回只读配置
+"""
+
+import os
+import functools
+from types import MappingProxyType
+from typing import Any, Mapping
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
+def _freeze(value: Any) -> Any:
+    """递归地将字典转为只读映射、列表转为元组"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_config(config_path: str, mtime_ns: int) -> Mapping[str, Any]:
+    """解析配置文件，按路径和修改时间缓存"""
+    with open(config_path, 'rb') as f:
+        return _freeze(yaml.load(f, Loader=_YamlLoader))
+
+
+def load_config(config_path: str = "config.yaml") -> Mapping[str, Any]:
+    """加载并缓存配置文件
+
+    以绝对路径和修改时间作为缓存键，文件未变化时直接复用已解析的结果。
+    返回的配置为只读结构，可在多个模块间安全共享同一实例。
+
+    Args:
+        config_path: 配置文件路径
+
+    Returns:
+        只读配置映射
+    """
+    try:
+        config_path = os.path.abspath(config_path)
+        return _parse_config(config_path, os.stat(config_path).st_mtime_ns)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid YAML configuration: {e}")
@@ -15,8 +15,10 @@ import json
 import shutil
 import logging
 from datetime import datetime, timezone
-from typing import List, Dict, Optional, Any, Tuple
-import yaml
+from typing import List, Dict, Optional, Any, Tuple, Mapping
+from .config import load_config
+from .file_utils import file_lock, write_atomic
+from .json_utils import json_loads, json_dumps
 
 
 class DataManager:
@@ -37,7 +39,7 @@ class DataManager:
         # 确保数据目录存在
         os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
         
-    def _load_config(self, config_path: str) -> Dict[str, Any]:
+    def _load_config(self, config_path: str) -> Mapping[str, Any]:
         """加载配置文件
         
         Args:
@@ -46,13 +48,7 @@ class DataManager:
         Returns:
             配置字典
         """
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Configuration file not found: {config_path}")
-        except yaml.YAMLError as e:
-            raise ValueError(f"Invalid YAML configuration: {e}")
+        return load_config(config_path)
     
     def _setup_logger(self) -> logging.Logger:
         """设置日志记录器
@@ -82,10 +78,10 @@ class DataManager:
             return self._create_empty_data_structure()
         
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.logger.info(f"Loaded data from {self.data_file}")
-                return data
+            with open(self.data_file, 'rb') as f:
+                data = json_loads(f.read())
+            self.logger.info(f"Loaded data from {self.data_file}")
+            return data
         except (json.JSONDecodeError, FileNotFoundError) as e:
             self.logger.error(f"Error loading data file: {e}")
             # 尝试从备份恢复
@@ -119,10 +115,10 @@ class DataManager:
         """
         if os.path.exists(self.backup_file):
             try:
-                with open(self.backup_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.logger.info(f"Restored data from backup: {self.backup_file}")
-                    return data
+                with open(self.backup_file, 'rb') as f:
+                    data = json_loads(f.read())
+                self.logger.info(f"Restored data from backup: {self.backup_file}")
+                return data
             except (json.JSONDecodeError, FileNotFoundError) as e:
                 self.logger.error(f"Error loading backup file: {e}")
         
@@ -139,16 +135,17 @@ class DataManager:
             是否保存成功
         """
         try:
-            # 创建备份
-            if self.auto_backup and os.path.exists(self.data_file):
-                self._create_backup()
-            
-            # 更新元数据
-            self._update_metadata(data)
-            
-            # 保存数据
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # 持有文件锁完成备份和写入，避免与其他步骤并发写入同一数据文件
+            with file_lock(self.data_file):
+                # 创建备份
+                if self.auto_backup and os.path.exists(self.data_file):
+                    self._create_backup()
+                
+                # 更新元数据
+                self._update_metadata(data)
+                
+                # 保存数据
+                write_atomic(self.data_file, json_dumps(data, indent=True))
             
             self.logger.info(f"Data saved successfully to {self.data_file}")
             return True
@@ -198,6 +195,51 @@ class DataManager:
             'last_update_time': datetime.now(timezone.utc).isoformat()
         })
     
+    @staticmethod
+    def _classification_fields(repo: Dict[str, Any]) -> Dict[str, Any]:
+        """提取仓库的分类相关字段
+        
+        Args:
+            repo: 仓库信息
+            
+        Returns:
+            分类字段字典
+        """
+        return {
+            'is_classified': repo.get('is_classified', False),
+            'category': repo.get('category'),
+            'summary': repo.get('summary'),
+            'key_features': repo.get('key_features', [])
+        }
+    
+    def carry_over_classifications(self, existing_repos: List[Dict[str, Any]],
+                                   new_repos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """将已有的分类结果带到新获取的仓库列表中，不保留已取消星标的仓库
+        
+        Args:
+            existing_repos: 现有仓库列表
+            new_repos: 新获取的仓库列表
+            
+        Returns:
+            带有分类信息的新仓库列表
+        """
+        classified = {
+            repo['id']: repo for repo in existing_repos
+            if repo.get('is_classified', False) and 'id' in repo
+        }
+        
+        result = []
+        reused_count = 0
+        for new_repo in new_repos:
+            existing_repo = classified.get(new_repo['id'])
+            if existing_repo is not None:
+                new_repo = {**new_repo, **self._classification_fields(existing_repo)}
+                reused_count += 1
+            result.append(new_repo)
+        
+        self.logger.info(f"Reused classification for {reused_count} of {len(new_repos)} repositories")
+        return result
+    
     def merge_repositories(self, existing_repos: List[Dict[str, Any]], new_repos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """合并仓库列表，避免重复
         
@@ -223,16 +265,8 @@ class DataManager:
                 existing_index = existing_ids[repo_id]
                 existing_repo = merged_repos[existing_index]
                 
-                # 保留分类相关字段
-                classification_fields = {
-                    'is_classified': existing_repo.get('is_classified', False),
-                    'category': existing_repo.get('category'),
-                    'summary': existing_repo.get('summary'),
-                    'key_features': existing_repo.get('key_features', [])
-                }
-                
-                # 更新仓库信息
-                merged_repos[existing_index] = {**new_repo, **classification_fields}
+                # 更新仓库信息，保留分类相关字段
+                merged_repos[existing_index] = {**new_repo, **self._classification_fields(existing_repo)}
                 updated_count += 1
                 
             else:
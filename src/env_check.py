@@ -25,8 +25,10 @@ class EnvironmentChecker:
         
         success = True
         
-        # 检查GitHub相关变量
-        if not os.getenv('GH_PAT'):
+        # 检查GitHub相关变量（GH_PATS 为可选的多令牌池）
+        if os.getenv('GH_PATS'):
+            print("✅ GH_PATS secret 已配置（多令牌轮换）")
+        elif not os.getenv('GH_PAT'):
             print("❌ GH_PAT secret is not set")
             print("💡 请在仓库设置中添加 GH_PAT secret")
             self.errors.append("GH_PAT secret 未设置")
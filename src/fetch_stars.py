@@ -10,13 +10,72 @@ GitHub Star Manager - 数据获取模块
 """
 
 import os
+import gzip
 import json
 import time
+import random
 import logging
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from collections import deque
 from datetime import datetime, timezone
-from typing import List, Dict, Optional, Any
-import yaml
+from pathlib import Path
+from typing import List, Dict, Optional, Any, Iterator, Tuple, Mapping, Union
+from urllib.parse import urlparse, parse_qs, urlencode
+from concurrent.futures import ThreadPoolExecutor
+from .config import load_config
+from .data_manager import DataManager
+from .file_utils import file_lock, write_atomic
+from .json_utils import json_loads, json_dumps
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# 两种HTTP客户端的异常类型，_make_request 统一处理
+_TIMEOUT_ERRORS = (requests.exceptions.Timeout,) + ((httpx.TimeoutException,) if httpx else ())
+_REQUEST_ERRORS = (requests.exceptions.RequestException,) + ((httpx.HTTPError,) if httpx else ())
+
+
+# GraphQL星标查询，只选取 _process_graphql_repo_data 使用的字段
+STARRED_REPOS_QUERY = """
+query($login: String!, $first: Int!, $after: String) {
+  user(login: $login) {
+    starredRepositories(first: $first, after: $after, orderBy: {field: STARRED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      edges {
+        starredAt
+        node {
+          databaseId
+          name
+          nameWithOwner
+          description
+          url
+          primaryLanguage { name }
+          stargazerCount
+          forkCount
+          issues(states: OPEN) { totalCount }
+          pullRequests(states: OPEN) { totalCount }
+          repositoryTopics(first: 20) { nodes { topic { name } } }
+          createdAt
+          updatedAt
+          pushedAt
+          diskUsage
+          defaultBranchRef { name }
+          isArchived
+          isDisabled
+          isPrivate
+          isFork
+          owner { login __typename }
+          licenseInfo { name }
+        }
+      }
+    }
+  }
+}
+"""
 
 
 class GitHubStarFetcher:
@@ -28,20 +87,33 @@ class GitHubStarFetcher:
         Args:
             config_path: 配置文件路径
         """
+        self.config_path = config_path
         self.config = self._load_config(config_path)
         self.github_token = os.getenv(self.config['env_vars']['github_token'])
+        self.tokens = self._load_tokens()
         self.username = os.getenv(self.config['env_vars']['github_username'])
         self.fetch_mode = os.getenv(self.config['env_vars']['fetch_mode'], 'incremental')
-        
-        if not self.github_token:
+        self.data_file = Path(self.config['data']['stars_data_file'])
+        self.page_cache_file = Path(self.config['data']['page_cache_file'])
+        self._page_cache: Dict[str, Dict[str, Any]] = {}
+        self._page_cache_dirty = False
+        # 本次获取到的最新收藏时间，作为下次增量获取的游标
+        self.last_starred_at: Optional[str] = None
+        
+        if not self.tokens:
             raise ValueError("GitHub token not found in environment variables")
         if not self.username:
             raise ValueError("GitHub username not found in environment variables")
             
-        self.session = self._setup_session()
         self.logger = self._setup_logger()
+        self.session = self._setup_session()
+        # 触发API限制时阻塞所有并发请求，直到限制重置
+        self._rate_limit_lock = threading.Lock()
+        # 各令牌已知的剩余额度和重置时间
+        self._token_lock = threading.Lock()
+        self._token_budgets = {token: {'remaining': None, 'reset': 0} for token in self.tokens}
         
-    def _load_config(self, config_path: str) -> Dict[str, Any]:
+    def _load_config(self, config_path: str) -> Mapping[str, Any]:
         """加载配置文件
         
         Args:
@@ -50,28 +122,119 @@ class GitHubStarFetcher:
         Returns:
             配置字典
         """
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Configuration file not found: {config_path}")
-        except yaml.YAMLError as e:
-            raise ValueError(f"Invalid YAML configuration: {e}")
+        return load_config(config_path)
     
-    def _setup_session(self) -> requests.Session:
+    def _setup_session(self) -> Union[requests.Session, 'httpx.Client']:
         """设置HTTP会话
         
+        配置启用 http2 且安装了 httpx[http2] 时，使用HTTP/2客户端在单个连接上复用并发的分页请求。
+        
         Returns:
-            配置好的requests会话
+            配置好的requests会话或httpx客户端
         """
+        if self.config['github'].get('http2', False):
+            client = self._setup_http2_client()
+            if client is not None:
+                return client
+        
         session = requests.Session()
+        # Authorization 由 _make_request 按所选令牌逐个请求设置
         session.headers.update({
-            'Authorization': f'token {self.github_token}',
-            'Accept': 'application/vnd.github.v3+json',
-            'User-Agent': f'GitHub-Star-Manager/{self.username}'
+            # star媒体类型会在每个条目中返回starred_at
+            'Accept': 'application/vnd.github.v3.star+json',
+            'User-Agent': f'GitHub-Star-Manager/{self.username}',
+            'Connection': 'keep-alive'
         })
+        
+        # 所有请求都发往同一主机，连接池大小与并发页数保持一致，重试由 _make_request 负责
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.config['performance'].get('max_concurrent_pages', 4),
+            max_retries=0
+        )
+        session.mount('https://', adapter)
         return session
     
+    def _setup_http2_client(self) -> Optional['httpx.Client']:
+        """创建HTTP/2客户端
+        
+        Returns:
+            httpx客户端，依赖缺失时返回None
+        """
+        if httpx is None:
+            self.logger.warning("httpx is not installed, falling back to requests over HTTP/1.1")
+            return None
+        
+        try:
+            # HTTP/2禁止Connection等逐跳头，由客户端自行维持长连接；
+            # httpx默认不跟随重定向，显式开启以与requests一致（仓库改名或转移后API返回301）
+            return httpx.Client(
+                http2=True,
+                follow_redirects=True,
+                headers={
+                    'Accept': 'application/vnd.github.v3.star+json',
+                    'User-Agent': f'GitHub-Star-Manager/{self.username}'
+                },
+                limits=httpx.Limits(max_connections=2, max_keepalive_connections=2)
+            )
+        except ImportError:
+            self.logger.warning("h2 is not installed, falling back to requests over HTTP/1.1")
+            return None
+    
+    def _load_tokens(self) -> List[str]:
+        """加载GitHub令牌池
+        
+        优先读取逗号分隔的多令牌环境变量，未设置时回退到单个令牌。
+        
+        Returns:
+            令牌列表
+        """
+        tokens_env = os.getenv(self.config['env_vars']['github_tokens'], '')
+        tokens = [token.strip() for token in tokens_env.split(',') if token.strip()]
+        
+        if not tokens and self.github_token:
+            tokens = [self.github_token]
+        
+        return list(dict.fromkeys(tokens))
+    
+    def _select_token(self) -> Tuple[str, float]:
+        """选择剩余额度最多的令牌
+        
+        Returns:
+            (令牌, 需要等待的秒数) 的元组；所有令牌额度耗尽时返回最早重置的令牌及其等待时间
+        """
+        now = time.time()
+        
+        with self._token_lock:
+            def available_budget(token: str) -> float:
+                budget = self._token_budgets[token]
+                if budget['remaining'] is None or budget['reset'] <= now:
+                    return float('inf')
+                return budget['remaining']
+            
+            token = max(self.tokens, key=available_budget)
+            if available_budget(token) > 0:
+                return token, 0
+            
+            token = min(self.tokens, key=lambda t: self._token_budgets[t]['reset'])
+            # 额外等待60秒，避免本地时钟偏差
+            return token, self._token_budgets[token]['reset'] - now + 60
+    
+    def _update_token_budget(self, token: str, response: requests.Response) -> None:
+        """根据响应头更新令牌的剩余额度
+        
+        Args:
+            token: 本次请求使用的令牌
+            response: 响应对象
+        """
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        
+        with self._token_lock:
+            self._token_budgets[token] = {'remaining': int(remaining), 'reset': int(reset)}
+    
     def _setup_logger(self) -> logging.Logger:
         """设置日志记录器
         
@@ -89,12 +252,16 @@ class GitHubStarFetcher:
             
         return logger
     
-    def _make_request(self, url: str, params: Optional[Dict] = None) -> Optional[requests.Response]:
+    def _make_request(self, url: str, params: Optional[Dict] = None,
+                      json_body: Optional[Dict] = None,
+                      headers: Optional[Dict] = None) -> Optional[requests.Response]:
         """发送HTTP请求，包含重试机制
         
         Args:
             url: 请求URL
             params: 请求参数
+            json_body: JSON请求体，提供时发送POST请求
+            headers: 额外的请求头
             
         Returns:
             响应对象或None
@@ -102,61 +269,82 @@ class GitHubStarFetcher:
         github_config = self.config['github']
         
         for attempt in range(github_config['max_retries'] + 1):
+            # 选择令牌；所有令牌额度耗尽时阻塞全部并发请求直到重置
+            with self._rate_limit_lock:
+                token, wait_time = self._select_token()
+                if wait_time > 0:
+                    self.logger.warning(f"API rate limit exceeded for all tokens. Waiting {wait_time:.0f} seconds...")
+                    time.sleep(wait_time)
+                    token, _ = self._select_token()
+            
             try:
-                response = self.session.get(
+                response = self.session.request(
+                    'POST' if json_body is not None else 'GET',
                     url,
                     params=params,
+                    json=json_body,
+                    headers={**(headers or {}), 'Authorization': f'token {token}'},
                     timeout=github_config['timeout']
                 )
+                self._update_token_budget(token, response)
                 
-                if response.status_code == 200:
+                if response.status_code in (200, 304):
                     return response
-                elif response.status_code == 403:
-                    # 检查是否是API限制
-                    if 'X-RateLimit-Remaining' in response.headers:
-                        remaining = int(response.headers['X-RateLimit-Remaining'])
-                        if remaining == 0:
-                            reset_time = int(response.headers['X-RateLimit-Reset'])
-                            wait_time = reset_time - int(time.time()) + 60
-                            self.logger.warning(f"API rate limit exceeded. Waiting {wait_time} seconds...")
-                            time.sleep(wait_time)
+                elif response.status_code in (403, 429):
+                    # 次级限制：服务器通过Retry-After给出确切的等待时间
+                    retry_after = response.headers.get('Retry-After')
+                    if retry_after is not None:
+                        try:
+                            wait_time = float(retry_after)
+                        except ValueError:
+                            wait_time = None
+                        if wait_time is not None:
+                            self.logger.warning(f"Secondary rate limit hit. Waiting {wait_time} seconds...")
+                            with self._rate_limit_lock:
+                                time.sleep(max(wait_time, 0))
                             continue
                     
-                    self.logger.error(f"Access forbidden: {response.text}")
-                    return None
+                    # 主限制：当前令牌额度耗尽，切换到其他令牌或等待重置
+                    if response.headers.get('X-RateLimit-Remaining') == '0':
+                        self.logger.warning("API rate limit exceeded for current token, rotating")
+                        continue
+                    
+                    if response.status_code == 403:
+                        self.logger.error(f"Access forbidden: {response.text}")
+                        return None
+                    self.logger.warning(f"Too many requests: {response.text}")
                 elif response.status_code == 404:
                     self.logger.error(f"Resource not found: {url}")
                     return None
                 else:
                     self.logger.warning(f"Request failed with status {response.status_code}: {response.text}")
                     
-            except requests.exceptions.Timeout:
+            except _TIMEOUT_ERRORS:
                 self.logger.warning(f"Request timeout (attempt {attempt + 1})")
-            except requests.exceptions.RequestException as e:
+            except _REQUEST_ERRORS as e:
                 self.logger.warning(f"Request error (attempt {attempt + 1}): {e}")
             
             if attempt < github_config['max_retries']:
-                wait_time = github_config['retry_delay'] * (2 ** attempt)
-                self.logger.info(f"Retrying in {wait_time} seconds...")
+                # 全抖动指数退避，避免并发请求同时重试
+                max_delay = min(github_config['max_retry_delay'], github_config['retry_delay'] * (2 ** attempt))
+                wait_time = random.uniform(0, max_delay)
+                self.logger.info(f"Retrying in {wait_time:.1f} seconds...")
                 time.sleep(wait_time)
         
         self.logger.error(f"Failed to fetch data after {github_config['max_retries']} retries")
         return None
     
-    def _get_last_fetch_time(self) -> Optional[str]:
-        """获取上次获取时间
+    @staticmethod
+    def _parse_time(value: str) -> datetime:
+        """解析GitHub返回的ISO 8601时间字符串
         
+        Args:
+            value: 时间字符串，如 2024-01-01T00:00:00Z
+            
         Returns:
-            上次获取时间的ISO格式字符串或None
+            带时区的datetime对象
         """
-        data_file = self.config['data']['stars_data_file']
-        
-        try:
-            with open(data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get('metadata', {}).get('last_fetch_time')
-        except (FileNotFoundError, json.JSONDecodeError, KeyError):
-            return None
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
     
     def fetch_starred_repos(self, mode: Optional[str] = None) -> List[Dict[str, Any]]:
         """获取星标仓库列表
@@ -181,51 +369,65 @@ class GitHubStarFetcher:
             check_updates = True
         
         repos = []
-        page = 1
-        per_page = 100  # GitHub API最大值
         
-        # 如果是增量模式，先加载现有数据用于比较
+        # 如果是增量模式，先加载现有数据用于比较，并读取上次的收藏时间游标
         existing_repos = {}
+        star_cursor = None
         if check_updates:
             existing_data = self._load_existing_data()
             if existing_data:
                 existing_repos = {repo['id']: repo for repo in existing_data.get('repositories', [])}
                 self.logger.info(f"Loaded {len(existing_repos)} existing repositories for comparison")
+                
+                last_starred_at = existing_data.get('metadata', {}).get('last_starred_at')
+                if last_starred_at:
+                    star_cursor = self._parse_time(last_starred_at)
+                    self.logger.info(f"Fetching stars newer than {last_starred_at}")
         
-        while len(repos) < max_repos:
-            # 构建请求参数
-            params = {
-                'page': page,
-                'per_page': min(per_page, max_repos - len(repos)),
-                'sort': 'updated',  # 按更新时间排序，更容易发现变化
-                'direction': 'desc'
-            }
-            
-            # 发送请求
+        # 有收藏时间游标时一直遍历到游标为止，不受数量上限约束，否则超出上限的新星标会被永久遗漏
+        repo_limit = None if star_cursor else max_repos
+        
+        # 固定每页数量，保证并发请求时各页的偏移量一致；有游标时使用最大页大小，减少回溯到游标的请求数
+        per_page = 100 if star_cursor else min(100, max_repos)  # GitHub API最大值为100
+        
+        if github_config.get('use_graphql', False):
+            pages = self._iter_graphql_pages(per_page)
+            process_repo = self._process_graphql_repo_data
+        else:
+            # 全量模式下不请求超出上限的页面
+            max_pages = None if check_updates else -(-max_repos // per_page)
             url = f"{github_config['api_base_url']}/users/{self.username}/starred"
-            response = self._make_request(url, params)
-            
-            if not response:
-                break
-            
-            page_repos = response.json()
-            
-            if not page_repos:
-                self.logger.info("No more repositories to fetch")
-                break
+            self._load_page_cache()
+            pages = self._iter_pages(url, per_page, max_pages, star_cursor)
+            process_repo = self._process_repo_data
+        
+        reached_cursor = False
+        newest_starred_at = None
+        for page, page_repos in enumerate(pages, 1):
+            # 全量模式下每个项目都会加入结果，直接按剩余数量截取本页
+            if not check_updates:
+                page_repos = page_repos[:max_repos - len(repos)]
             
             # 处理仓库数据
             for repo in page_repos:
-                if len(repos) >= max_repos:
+                if repo_limit is not None and len(repos) >= repo_limit:
                     break
                     
-                processed_repo = self._process_repo_data(repo)
+                processed_repo = process_repo(repo)
+                
+                # 星标按收藏时间倒序返回，遇到上次游标之前的项目即可停止
+                if star_cursor and self._parse_time(processed_repo['starred_at']) <= star_cursor:
+                    self.logger.info("Reached previously fetched stars")
+                    reached_cursor = True
+                    break
+                
+                if newest_starred_at is None:
+                    newest_starred_at = processed_repo['starred_at']
                 
                 # 如果是增量模式，检查项目是否有变化
                 if check_updates and existing_repos:
-                    repo_id = processed_repo['id']
-                    if repo_id in existing_repos:
-                        existing_repo = existing_repos[repo_id]
+                    existing_repo = existing_repos.get(processed_repo['id'])
+                    if existing_repo is not None:
                         if self._has_repo_changed(existing_repo, processed_repo):
                             self.logger.info(f"Detected changes in repository: {processed_repo['full_name']}")
                             repos.append(processed_repo)
@@ -239,25 +441,226 @@ class GitHubStarFetcher:
                     repos.append(processed_repo)
             
             self.logger.info(f"Fetched page {page}, total repos: {len(repos)}")
-            page += 1
             
-            # 添加请求间隔
-            time.sleep(self.config['performance']['request_interval'])
+            if reached_cursor or (repo_limit is not None and len(repos) >= repo_limit):
+                pages.close()
+                break
+        
+        # 只有确认遍历完整时才推进游标：全量模式、到达上次游标，或没有游标且未触及数量上限；
+        # 否则保留原游标，下次运行重新获取
+        capped = repo_limit is not None and len(repos) >= repo_limit
+        if not check_updates or reached_cursor or (star_cursor is None and not capped):
+            self.last_starred_at = newest_starred_at
+        elif newest_starred_at:
+            self.logger.warning("Stopped before reaching previously fetched stars, not advancing the star cursor")
+        
+        self._save_page_cache()
         
         self.logger.info(f"Successfully fetched {len(repos)} repositories")
         return repos
     
-    def _load_existing_data(self) -> Optional[Dict[str, Any]]:
+    def _iter_pages(self, url: str, per_page: int, max_pages: Optional[int] = None,
+                    star_cursor: Optional[datetime] = None) -> Iterator[List[Dict[str, Any]]]:
+        """按页码顺序迭代星标仓库，并在后台预取后续页面
+        
+        先同步获取第一页，通过Link头确定总页数；调用方继续迭代时才补满预取窗口，
+        使网络请求与数据处理重叠进行，调用方提前停止时也不会多发请求。
+        
+        Args:
+            url: 星标列表URL
+            per_page: 每页数量
+            max_pages: 最多获取的页数，None表示不限制
+            star_cursor: 上次的收藏时间游标，某一页已包含游标之前的星标时不再预取后续页面
+            
+        Yields:
+            每一页的仓库数据列表
+        """
+        page_data = self._fetch_page(url, 1, per_page)
+        if not page_data:
+            return
+        
+        last_page = page_data['last_page']
+        if max_pages is not None:
+            last_page = min(last_page, max_pages)
+        self.logger.info(f"Starred repositories span {last_page} page(s)")
+        
+        max_workers = self.config['performance'].get('max_concurrent_pages', 4)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            next_page = 2
+            
+            try:
+                while page_data:
+                    page_repos = page_data['items']
+                    if not page_repos:
+                        self.logger.info("No more repositories to fetch")
+                        return
+                    
+                    yield page_repos
+                    
+                    # 星标按收藏时间倒序返回，本页末尾已到达游标时后续页面都是旧数据
+                    if star_cursor and self._parse_time(page_repos[-1]['starred_at']) <= star_cursor:
+                        return
+                    
+                    # 已到最后一页时直接结束，不再发出空页探测请求
+                    while next_page <= last_page and len(pending) < max_workers:
+                        pending.append(executor.submit(self._fetch_page, url, next_page, per_page))
+                        next_page += 1
+                    
+                    if not pending:
+                        return
+                    page_data = pending.popleft().result()
+            finally:
+                # 提前结束时取消尚未开始的预取请求
+                for future in pending:
+                    future.cancel()
+    
+    def _iter_graphql_pages(self, per_page: int) -> Iterator[List[Dict[str, Any]]]:
+        """通过GraphQL API按游标迭代星标仓库
+        
+        Args:
+            per_page: 每页数量
+            
+        Yields:
+            每一页的星标边（包含starredAt和node）列表
+        """
+        url = f"{self.config['github']['api_base_url']}/graphql"
+        cursor = None
+        
+        while True:
+            payload = {
+                'query': STARRED_REPOS_QUERY,
+                'variables': {'login': self.username, 'first': per_page, 'after': cursor}
+            }
+            response = self._make_request(url, json_body=payload)
+            if not response:
+                return
+            
+            result = json_loads(response.content)
+            if result.get('errors'):
+                self.logger.error(f"GraphQL query failed: {result['errors']}")
+                return
+            
+            user = (result.get('data') or {}).get('user')
+            if not user:
+                self.logger.error(f"GitHub user not found: {self.username}")
+                return
+            
+            starred = user['starredRepositories']
+            if not starred['edges']:
+                self.logger.info("No more repositories to fetch")
+                return
+            
+            yield starred['edges']
+            
+            page_info = starred['pageInfo']
+            if not page_info['hasNextPage']:
+                return
+            cursor = page_info['endCursor']
+    
+    def _fetch_page(self, url: str, page: int, per_page: int) -> Optional[Dict[str, Any]]:
+        """获取单页星标仓库，使用ETag条件请求避免重复传输
+        
+        Args:
+            url: 星标列表URL
+            page: 页码
+            per_page: 每页数量
+            
+        Returns:
+            包含 items（仓库列表）和 last_page（最后页码）的字典，失败时返回None
+        """
+        params = {
+            'page': page,
+            'per_page': per_page,
+            'sort': 'created',  # 按收藏时间排序，配合增量游标使用
+            'direction': 'desc'
+        }
+        cache_key = f"{url}?{urlencode(params)}"
+        cached = self._page_cache.get(cache_key)
+        headers = {'If-None-Match': cached['etag']} if cached else None
+        
+        response = self._make_request(url, params, headers=headers)
+        if not response:
+            return None
+        
+        if response.status_code == 304:
+            # 页面未变化，不消耗API限额，直接使用缓存内容
+            self.logger.debug(f"Page {page} not modified, using cached data")
+            return cached
+        
+        page_data = {
+            'items': json_loads(response.content),
+            'last_page': self._get_last_page(response)
+        }
+        
+        etag = response.headers.get('ETag')
+        if etag:
+            self._page_cache[cache_key] = {**page_data, 'etag': etag}
+            self._page_cache_dirty = True
+        
+        return page_data
+    
+    def _get_last_page(self, response: requests.Response) -> int:
+        """从Link响应头中解析最后一页的页码
+        
+        Args:
+            response: 第一页的响应对象
+            
+        Returns:
+            最后一页的页码，没有分页信息时返回1
+        """
+        last_link = response.links.get('last')
+        if not last_link:
+            return 1
+        
+        query = parse_qs(urlparse(last_link['url']).query)
+        try:
+            return int(query['page'][0])
+        except (KeyError, IndexError, ValueError):
+            self.logger.warning(f"Unable to parse last page from Link header: {last_link['url']}")
+            return 1
+    
+    def _load_page_cache(self) -> None:
+        """加载分页ETag缓存"""
+        if not self.page_cache_file.exists():
+            return
+        
+        try:
+            with gzip.open(self.page_cache_file, 'rb') as f:
+                self._page_cache = json_loads(f.read())
+            self.logger.info(f"Loaded {len(self._page_cache)} cached pages from {self.page_cache_file}")
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.warning(f"Failed to load page cache: {e}")
+            self._page_cache = {}
+    
+    def _save_page_cache(self) -> None:
+        """保存分页ETag缓存，仅在内容变化时写入"""
+        if not self._page_cache_dirty:
+            return
+        
+        try:
+            self.page_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # 固定gzip头中的时间戳，内容不变时文件保持一致
+            with gzip.GzipFile(self.page_cache_file, 'wb', mtime=0) as f:
+                f.write(json_dumps(self._page_cache))
+            self._page_cache_dirty = False
+        except OSError as e:
+            self.logger.warning(f"Failed to save page cache: {e}")
+    
+    def _load_existing_data(self, path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
         """加载现有的数据文件
         
+        Args:
+            path: 数据文件路径，默认使用配置文件中的路径
+            
         Returns:
             现有数据字典，如果文件不存在则返回None
         """
-        data_file = self.config['data']['stars_data_file']
-        if os.path.exists(data_file):
+        path = path or self.data_file
+        if path.exists():
             try:
-                with open(data_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return json_loads(path.read_bytes())
             except Exception as e:
                 self.logger.warning(f"Failed to load existing data: {e}")
         return None
@@ -287,15 +690,19 @@ class GitHubStarFetcher:
         
         return False
     
-    def _process_repo_data(self, repo: Dict[str, Any]) -> Dict[str, Any]:
+    def _process_repo_data(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """处理仓库数据，提取需要的字段
         
         Args:
-            repo: GitHub API返回的仓库数据
+            item: GitHub API返回的星标条目，包含starred_at和repo
             
         Returns:
             处理后的仓库数据
         """
+        repo = item['repo']
+        owner = repo['owner']
+        license_info = repo.get('license')
+        
         return {
             'id': repo['id'],
             'name': repo['name'],
@@ -317,50 +724,118 @@ class GitHubStarFetcher:
             'disabled': repo.get('disabled', False),
             'private': repo['private'],
             'fork': repo['fork'],
+            'owner': {
+                'login': owner['login'],
+                'type': owner['type']
+            },
+            'license': license_info['name'] if license_info else None,
+            'starred_at': item['starred_at'],
+            'is_classified': False,
+            'category': None,
+            'summary': None,
+            'key_features': []
+        }
+    
+    def _process_graphql_repo_data(self, edge: Dict[str, Any]) -> Dict[str, Any]:
+        """处理GraphQL返回的星标数据，输出与 _process_repo_data 相同的结构
+        
+        Args:
+            edge: GraphQL星标边，包含starredAt和node
+            
+        Returns:
+            处理后的仓库数据
+        """
+        repo = edge['node']
+        language = repo.get('primaryLanguage')
+        branch = repo.get('defaultBranchRef')
+        license_info = repo.get('licenseInfo')
+        
+        return {
+            'id': repo['databaseId'],
+            'name': repo['name'],
+            'full_name': repo['nameWithOwner'],
+            'description': repo.get('description', ''),
+            'html_url': repo['url'],
+            'clone_url': f"{repo['url']}.git",
+            'language': language['name'] if language else None,
+            'stargazers_count': repo['stargazerCount'],
+            'forks_count': repo['forkCount'],
+            'open_issues_count': repo['issues']['totalCount'] + repo['pullRequests']['totalCount'],
+            'topics': [item['topic']['name'] for item in repo['repositoryTopics']['nodes']],
+            'created_at': repo['createdAt'],
+            'updated_at': repo['updatedAt'],
+            'pushed_at': repo.get('pushedAt'),
+            'size': repo['diskUsage'],
+            'default_branch': branch['name'] if branch else None,
+            'archived': repo.get('isArchived', False),
+            'disabled': repo.get('isDisabled', False),
+            'private': repo['isPrivate'],
+            'fork': repo['isFork'],
             'owner': {
                 'login': repo['owner']['login'],
-                'type': repo['owner']['type']
+                'type': repo['owner']['__typename']
             },
-            'license': repo['license']['name'] if repo.get('license') else None,
-            'starred_at': datetime.now(timezone.utc).isoformat(),
+            'license': license_info['name'] if license_info else None,
+            'starred_at': edge['starredAt'],
             'is_classified': False,
             'category': None,
             'summary': None,
             'key_features': []
         }
     
-    def save_repos_data(self, repos: List[Dict[str, Any]], output_file: Optional[str] = None) -> str:
+    def save_repos_data(self, repos: List[Dict[str, Any]], output_file: Optional[str] = None,
+                        merge: Optional[bool] = None) -> str:
         """保存仓库数据到文件
         
         Args:
             repos: 仓库数据列表
             output_file: 输出文件路径，默认使用配置文件中的路径
+            merge: 是否与现有数据合并，默认在增量模式下合并
             
         Returns:
             保存的文件路径
         """
-        output_path = output_file or self.config['data']['stars_data_file']
+        output_path = Path(output_file) if output_file else self.data_file
+        if merge is None:
+            merge = self.fetch_mode != 'full'
         
         # 确保目录存在
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        # 准备数据
-        data = {
-            'metadata': {
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # 持有文件锁完成读取、合并和写入，避免并发运行互相覆盖
+        with file_lock(output_path):
+            # 增量模式下合并到现有数据，保留已有项目及其分类信息；
+            # 全量模式下以新数据为准，但沿用已有的分类结果，避免重复调用AI
+            metadata = {}
+            existing_data = self._load_existing_data(output_path)
+            if existing_data:
+                existing_repos = existing_data.get('repositories', [])
+                if merge:
+                    metadata = existing_data.get('metadata', {})
+                    repos = DataManager(self.config_path).merge_repositories(existing_repos, repos)
+                else:
+                    repos = DataManager(self.config_path).carry_over_classifications(existing_repos, repos)
+            
+            # 准备数据
+            metadata.update({
                 'total_count': len(repos),
                 'fetch_mode': self.fetch_mode,
                 'last_fetch_time': datetime.now(timezone.utc).isoformat(),
                 'username': self.username
-            },
-            'repositories': repos
-        }
-        
-        # 保存数据
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+            })
+            if self.last_starred_at:
+                metadata['last_starred_at'] = self.last_starred_at
+            
+            data = {
+                'metadata': metadata,
+                'repositories': repos
+            }
+            
+            # 保存数据
+            write_atomic(output_path, json_dumps(data, indent=True))
         
         self.logger.info(f"Saved {len(repos)} repositories to {output_path}")
-        return output_path
+        return str(output_path)
 
 
 def main():
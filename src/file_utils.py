@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GitHub Star Manager - 文件写入模块
+
+功能：
+- 统一数据文件、分类文档和README的原子写入，供各模块共享
+- 提供跨进程的文件锁，保护数据文件的读取-修改-写入过程
+"""
+
+import os
+import contextlib
+from typing import Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # 非POSIX平台不支持文件锁
+    fcntl = None
+
+
+@contextlib.contextmanager
+def file_lock(path: Union[str, os.PathLike]) -> Iterator[None]:
+    """对目标文件加排他锁，使用同目录下的 .lock 文件
+
+    flock锁属于打开的文件描述，同一进程内不可嵌套获取同一文件的锁。
+
+    Args:
+        path: 需要保护的文件路径
+    """
+    if fcntl is None:
+        yield
+        return
+    
+    with open(f"{os.fspath(path)}.lock", 'w') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def write_atomic(path: Union[str, os.PathLike], content: bytes) -> None:
+    """先写入同目录下的临时文件并落盘，再原子替换目标文件
+
+    中途失败不会破坏原文件；替换前调用fsync，掉电或崩溃后也不会出现内容不完整的新文件。
+
+    Args:
+        path: 目标文件路径
+        content: 文件内容
+    """
+    tmp_path = f"{os.fspath(path)}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
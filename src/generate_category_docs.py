@@ -10,11 +10,58 @@ GitHub Star Manager - 分类文档生成模块
 """
 
 import os
+import re
+import json
+import hashlib
+import heapq
 import logging
+import functools
+import threading
 from datetime import datetime
-from typing import List, Dict, Any
-import yaml
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Mapping, NamedTuple, Optional, Tuple
+from .config import load_config
 from .data_manager import DataManager
+from .file_utils import write_atomic
+
+# 从已生成文档中解析统计信息的正则，模块加载时编译一次
+_TOTAL_RE = re.compile(r'本分类共有 \*\*(\d+)\*\* 个项目')
+_REPO_RE = re.compile(r'### \[([^\]]+)\]\([^\)]+\).*?\*\*星数\*\*: ⭐ ([\d,]+)', re.DOTALL)
+_STATS_RE = re.compile(r'总共有 \*\*(\d+)\*\* 个分类，包含 \*\*(\d+)\*\* 个项目')
+_CATEGORY_ROW_RE = re.compile(r'\| ([^|]+) \| (\d+) \|')
+_COMPLETION_RE = re.compile(r'\*\*分类完成率\*\*: ([\d\.]+)%')
+# 仓库条目模板
+_ENTRY_HEADER_TPL = "### [{name}]({html_url})\n\n**仓库**: {full_name}\n\n**描述**: {description}\n\n"
+_ENTRY_SUMMARY_TPL = "**AI摘要**: {summary}\n\n"
+_ENTRY_FEATURE_TPL = "- {}\n"
+_ENTRY_FOOTER_TPL = "**语言**: {language} | **星数**: ⭐ {stars:,}\n\n---\n\n"
+# 文档中固定不变的Markdown片段
+_TOC_HEADER = "## 目录\n\n"
+_TOC_FOOTER = "\n---\n\n"
+_LIST_HEADER = "## 项目列表\n\n"
+_DOC_FOOTER_TAIL = ("---\n\n"
+                    "*本文档由 [GitHub Star Manager](https://github.com/your-username/github-star-manager) 自动生成*\n")
+_INDEX_TABLE_HEADER = "## 分类列表\n\n| 分类 | 项目数量 | 文档链接 |\n|------|----------|----------|\n"
+_LANGUAGE_TABLE_HEADER = "## 主要编程语言\n\n| 语言 | 项目数量 |\n|------|----------|\n"
+# 目录锚点中需要替换为连字符的字符
+_ANCHOR_TABLE = str.maketrans({' ': '-', '_': '-'})
+# 去除星数中的千位分隔符
+_COMMA_TABLE = str.maketrans('', '', ',')
+# 计算内容哈希时忽略的时间戳行，只匹配生成器自己输出的两种时间戳格式，
+# 项目描述中出现相同字样的行仍参与比较
+_TIMESTAMP_RE = re.compile(
+    r'^(?:\*最后更新时间: \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\*'
+    r'|- \*\*生成时间\*\*: \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})$',
+    re.MULTILINE
+)
+
+
+class _CategorySummary(NamedTuple):
+    """分类文档的计数摘要，头部和页脚共用"""
+    name: str
+    total: int
+    displayed: int
 
 
 class CategoryDocGenerator:
@@ -30,12 +77,25 @@ class CategoryDocGenerator:
         self.data_manager = DataManager(config_path)
         self.output_dir = self.config['docs']['output_dir']
         self.max_projects = self.config['docs']['max_projects_per_category']
+        self.max_workers = self.config['performance'].get('max_doc_workers', 4)
+        # 强制重写所有文档，跳过内容哈希比较（如修复被手动修改的文档）
+        self.force = False
+        # 本次生成使用统一的时间戳，各文档和索引保持一致
+        self.generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # 记录已生成文档摘要的清单文件，更新检查时无需回读Markdown
+        self.manifest_file = os.path.join(self.output_dir, '.manifest.json')
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._manifest_dirty = False
+        self._manifest_lock = threading.Lock()
+        # 同一次运行中多个步骤共用的数据和统计信息
+        self._data_cache: Optional[Dict[str, Any]] = None
+        self._stats_cache: Optional[Dict[str, Any]] = None
         self.logger = self._setup_logger()
         
         # 确保输出目录存在
         os.makedirs(self.output_dir, exist_ok=True)
         
-    def _load_config(self, config_path: str) -> Dict[str, Any]:
+    def _load_config(self, config_path: str) -> Mapping[str, Any]:
         """加载配置文件
         
         Args:
@@ -44,13 +104,7 @@ class CategoryDocGenerator:
         Returns:
             配置字典
         """
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Configuration file not found: {config_path}")
-        except yaml.YAMLError as e:
-            raise ValueError(f"Invalid YAML configuration: {e}")
+        return load_config(config_path)
     
     def _setup_logger(self) -> logging.Logger:
         """设置日志记录器
@@ -78,55 +132,51 @@ class CategoryDocGenerator:
         Returns:
             格式化的Markdown字符串
         """
-        name = repo.get('name', '')
-        full_name = repo.get('full_name', '')
         description = repo.get('description', '暂无描述')
-        html_url = repo.get('html_url', '')
-        language = repo.get('language', '未知')
-        stars = repo.get('stargazers_count', 0)
-        summary = repo.get('summary', description)
+        fields = {
+            'name': repo.get('name', ''),
+            'full_name': repo.get('full_name', ''),
+            'description': description,
+            'html_url': repo.get('html_url', ''),
+            'language': repo.get('language', '未知'),
+            'stars': repo.get('stargazers_count', 0),
+            'summary': repo.get('summary', description)
+        }
         key_features = repo.get('key_features', [])
         
         # 构建条目
-        entry = f"### [{name}]({html_url})\n\n"
-        entry += f"**仓库**: {full_name}\n\n"
-        entry += f"**描述**: {description}\n\n"
+        parts = [_ENTRY_HEADER_TPL.format_map(fields)]
         
-        if summary and summary != description:
-            entry += f"**AI摘要**: {summary}\n\n"
+        if fields['summary'] and fields['summary'] != description:
+            parts.append(_ENTRY_SUMMARY_TPL.format_map(fields))
         
         if key_features:
-            entry += "**关键特性**:\n"
-            for feature in key_features:
-                entry += f"- {feature}\n"
-            entry += "\n"
+            parts.append("**关键特性**:\n")
+            parts.extend(map(_ENTRY_FEATURE_TPL.format, key_features))
+            parts.append("\n")
         
-        entry += f"**语言**: {language} | **星数**: ⭐ {stars:,}\n\n"
-        entry += "---\n\n"
+        parts.append(_ENTRY_FOOTER_TPL.format_map(fields))
         
-        return entry
+        return "".join(parts)
     
-    def _generate_category_header(self, category: str, repos: List[Dict[str, Any]], total_in_category: int) -> str:
+    def _generate_category_header(self, summary: _CategorySummary) -> str:
         """生成分类文档头部
         
         Args:
-            category: 分类名称
-            repos: 显示的仓库列表
-            total_in_category: 该分类的总项目数
+            summary: 分类计数摘要
             
         Returns:
             头部Markdown字符串
         """
-        header = f"# {category}\n\n"
-        header += f"本分类共有 **{total_in_category}** 个项目"
+        parts = [f"# {summary.name}\n\n", f"本分类共有 **{summary.total}** 个项目"]
         
-        if len(repos) < total_in_category:
-            header += f"，当前显示前 **{len(repos)}** 个项目"
+        if summary.displayed < summary.total:
+            parts.append(f"，当前显示前 **{summary.displayed}** 个项目")
         
-        header += f"。\n\n"
-        header += f"*最后更新时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n\n"
+        parts.append("。\n\n")
+        parts.append(f"*最后更新时间: {self.generated_at}*\n\n")
         
-        return header
+        return "".join(parts)
     
     def _generate_category_toc(self, repos: List[Dict[str, Any]]) -> str:
         """生成分类目录
@@ -140,43 +190,181 @@ class CategoryDocGenerator:
         if not repos:
             return ""
         
-        toc = "## 目录\n\n"
+        parts = [_TOC_HEADER]
         for i, repo in enumerate(repos, 1):
             name = repo.get('name', '')
             # 生成锚点链接
-            anchor = name.lower().replace(' ', '-').replace('_', '-')
-            toc += f"{i}. [{name}](#{anchor})\n"
+            anchor = name.lower().translate(_ANCHOR_TABLE)
+            parts.append(f"{i}. [{name}](#{anchor})\n")
+        
+        parts.append(_TOC_FOOTER)
+        return "".join(parts)
+    
+    def _get_data_and_stats(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """加载数据及统计信息，同一生成器实例只读取一次
+        
+        Returns:
+            (数据字典, 统计信息) 元组
+        """
+        if self._data_cache is None:
+            self._data_cache = self.data_manager.load_data()
+            self._stats_cache = self.data_manager.get_statistics(self._data_cache)
+        return self._data_cache, self._stats_cache
+    
+    def _load_manifest(self) -> Dict[str, Any]:
+        """加载文档清单，每个进程只读取一次
+        
+        Returns:
+            清单字典，键为分类名称，索引文档使用 __index__
+        """
+        with self._manifest_lock:
+            if self._manifest is None:
+                try:
+                    with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                        self._manifest = json.load(f)
+                except FileNotFoundError:
+                    self._manifest = {}
+                except (OSError, json.JSONDecodeError) as e:
+                    self.logger.warning(f"Failed to load document manifest: {e}")
+                    self._manifest = {}
+            return self._manifest
+    
+    def _update_manifest(self, key: str, entry: Optional[Dict[str, Any]]) -> None:
+        """更新清单中的一项，entry为None时删除该项
+        
+        Args:
+            key: 分类名称或 __index__
+            entry: 文档摘要
+        """
+        manifest = self._load_manifest()
+        with self._manifest_lock:
+            if entry is None:
+                if manifest.pop(key, None) is None:
+                    return
+            else:
+                manifest[key] = entry
+            self._manifest_dirty = True
+    
+    def _save_manifest(self) -> None:
+        """保存文档清单，仅在内容变化时写入"""
+        with self._manifest_lock:
+            if not self._manifest_dirty:
+                return
+            
+            try:
+                content = json.dumps(self._manifest, ensure_ascii=False, indent=2, sort_keys=True)
+                write_atomic(self.manifest_file, content.encode('utf-8'))
+                self._manifest_dirty = False
+            except OSError as e:
+                self.logger.error(f"Error saving document manifest: {e}")
+    
+    def _read_manifest_entry(self, category: str) -> Optional[Dict[str, Any]]:
+        """解析现有分类文档，还原清单中的摘要
+        
+        Args:
+            category: 分类名称
+            
+        Returns:
+            文档摘要，文档不存在或无法解析时返回None
+        """
+        filepath = os.path.join(self.output_dir, self._category_filename(category))
+        try:
+            with open(filepath, 'rb') as f:
+                content = f.read().decode('utf-8')
+        except OSError:
+            return None
+        
+        match = _TOTAL_RE.search(content)
+        if not match:
+            return None
+        
+        return {
+            'total': int(match.group(1)),
+            'displayed': [[name, int(stars_str.translate(_COMMA_TABLE))]
+                          for name, stars_str in _REPO_RE.findall(content)]
+        }
+    
+    def _prime_manifest_from_disk(self, categories: List[str]) -> None:
+        """为清单中缺失的分类并发解析现有文档，之后的更新检查只需比较清单
         
-        toc += "\n---\n\n"
-        return toc
+        Args:
+            categories: 需要检查的分类列表
+        """
+        manifest = self._load_manifest()
+        missing = [category for category in categories if category not in manifest]
+        if not missing:
+            return
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            entries = list(executor.map(self._read_manifest_entry, missing))
+        
+        primed = 0
+        for category, entry in zip(missing, entries):
+            if entry is not None:
+                self._update_manifest(category, entry)
+                primed += 1
+        
+        if primed:
+            self.logger.info(f"Primed document manifest from {primed} existing documents")
     
-    def _check_document_needs_update(self, category: str, repos: List[Dict[str, Any]]) -> bool:
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _category_filename(category: str) -> str:
+        """获取分类对应的文档文件名
+        
+        Args:
+            category: 分类名称
+            
+        Returns:
+            文档文件名
+        """
+        return f"{category.replace('/', '_')}.md"
+    
+    def _check_document_needs_update(self, category: str, repos: List[Dict[str, Any]],
+                                     display_repos: List[Dict[str, Any]]) -> bool:
         """检查分类文档是否需要更新
         
         Args:
             category: 分类名称
-            repos: 仓库列表
+            repos: 该分类的全部仓库
+            display_repos: 按星数降序排列、需要显示的仓库
             
         Returns:
             是否需要更新
         """
-        filename = f"{category.replace('/', '_')}.md"
-        filepath = os.path.join(self.output_dir, filename)
+        filepath = os.path.join(self.output_dir, self._category_filename(category))
         
         # 如果文件不存在，需要创建
         if not os.path.exists(filepath):
             self.logger.info(f"Document does not exist, creating new: {filepath}")
             return True
         
+        # 优先与清单中记录的摘要比较
+        entry = self._load_manifest().get(category)
+        if entry is not None:
+            if entry.get('total') != len(repos):
+                self.logger.info(f"Repository count changed for {category}: {entry.get('total')} -> {len(repos)}")
+                return True
+            if entry.get('displayed') != self._displayed_summary(display_repos):
+                self.logger.info(f"Displayed repositories changed for {category}")
+                return True
+            
+            self.logger.info(f"No changes detected for category: {category}")
+            return False
+        
+        # 清单中没有记录时（如首次运行），文档比数据文件新则无需检查内容
+        if self._is_newer_than_data(filepath):
+            self.logger.info(f"Document is newer than data file, skipping check: {category}")
+            return False
+        
+        # 否则回退到解析现有文档
         try:
             # 读取现有文档
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with open(filepath, 'rb') as f:
+                content = f.read().decode('utf-8')
             
             # 检查仓库数量是否变化
-            import re
-            total_pattern = re.compile(r'本分类共有 \*\*(\d+)\*\* 个项目')
-            match = total_pattern.search(content)
+            match = _TOTAL_RE.search(content)
             if not match:
                 return True
             
@@ -188,30 +376,21 @@ class CategoryDocGenerator:
                 return True
             
             # 检查仓库列表是否变化（通过检查仓库名称和星数）
-            repo_pattern = re.compile(r'### \[([^\]]+)\]\([^\)]+\).*?\*\*星数\*\*: ⭐ ([\d,]+)', re.DOTALL)
-            repo_matches = repo_pattern.findall(content)
+            repo_matches = _REPO_RE.findall(content)
             
-            if len(repo_matches) != min(len(repos), self.max_projects):
+            if len(repo_matches) != len(display_repos):
                 self.logger.info(f"Displayed repository count changed for {category}")
                 return True
             
             # 创建现有文档中的仓库映射
-            existing_repos = {}
-            for name, stars_str in repo_matches:
-                stars = int(stars_str.replace(',', ''))
-                existing_repos[name] = stars
-            
-            # 检查前N个仓库是否有变化
-            sorted_repos = sorted(repos, key=lambda x: x.get('stargazers_count', 0), reverse=True)
-            display_repos = sorted_repos[:self.max_projects]
-            
-            for repo in display_repos:
-                name = repo.get('name', '')
-                stars = repo.get('stargazers_count', 0)
-                
-                if name not in existing_repos or existing_repos[name] != stars:
-                    self.logger.info(f"Repository {name} changed or new in {category}")
-                    return True
+            existing_repos = {name: int(stars_str.translate(_COMMA_TABLE)) for name, stars_str in repo_matches}
+            
+            # 检查前N个仓库是否有变化，遇到第一个变化即返回
+            changed = next((repo for repo in display_repos
+                            if existing_repos.get(repo.get('name', '')) != repo.get('stargazers_count', 0)), None)
+            if changed is not None:
+                self.logger.info(f"Repository {changed.get('name', '')} changed or new in {category}")
+                return True
             
             self.logger.info(f"No changes detected for category: {category}")
             return False
@@ -220,49 +399,155 @@ class CategoryDocGenerator:
             self.logger.error(f"Error checking document update for {category}: {e}")
             return True  # 出错时默认更新
     
-    def generate_category_document(self, category: str) -> bool:
+    def _is_newer_than_data(self, path: str) -> bool:
+        """判断文档的修改时间是否不早于数据文件
+        
+        Args:
+            path: 文档路径
+            
+        Returns:
+            文档不早于数据文件时返回True，无法获取时间时返回False
+        """
+        try:
+            return os.path.getmtime(path) >= os.path.getmtime(self.data_manager.data_file)
+        except OSError:
+            return False
+    
+    @staticmethod
+    def _content_hash(content: str) -> str:
+        """计算文档内容哈希，忽略时间戳行
+        
+        Args:
+            content: 文档内容
+            
+        Returns:
+            十六进制哈希字符串
+        """
+        return hashlib.blake2b(_TIMESTAMP_RE.sub('', content).encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _is_unchanged(self, key: str, path: str, content_hash: str) -> bool:
+        """判断文档内容是否与上次写入时相同
+        
+        Args:
+            key: 清单中的键
+            path: 文档路径
+            content_hash: 新内容的哈希
+            
+        Returns:
+            内容未变化且文件存在时返回True，强制更新时始终返回False
+        """
+        if self.force:
+            return False
+        
+        entry = self._load_manifest().get(key)
+        if entry is not None and 'hash' in entry:
+            return entry['hash'] == content_hash and os.path.exists(path)
+        
+        # 清单中没有哈希记录时，直接与磁盘上的现有文件比较
+        return self._file_content_hash(path) == content_hash
+    
+    def _file_content_hash(self, path: str) -> Optional[str]:
+        """读取现有文档并计算内容哈希
+        
+        Args:
+            path: 文档路径
+            
+        Returns:
+            十六进制哈希字符串，文件不存在或为空时返回None
+        """
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            if not data:
+                return None
+            return self._content_hash(data.decode('utf-8'))
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                self.logger.debug(f"Failed to read existing document {path}: {e}")
+            return None
+    
+    @staticmethod
+    def _displayed_summary(display_repos: List[Dict[str, Any]]) -> List[List[Any]]:
+        """提取显示仓库的名称和星数，用于清单记录和比较
+        
+        Args:
+            display_repos: 显示的仓库列表
+            
+        Returns:
+            [名称, 星数] 列表
+        """
+        return [[repo.get('name', ''), repo.get('stargazers_count', 0)] for repo in display_repos]
+    
+    @staticmethod
+    def _build_category_index(data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """遍历一次数据，将已分类的仓库按分类分组
+        
+        Args:
+            data: 数据字典
+            
+        Returns:
+            分类名称到仓库列表的映射
+        """
+        category_index: Dict[str, List[Dict[str, Any]]] = {}
+        for repo in data.get('repositories', []):
+            if repo.get('is_classified', False):
+                category_index.setdefault(repo.get('category'), []).append(repo)
+        return category_index
+    
+    def generate_category_document(self, category: str, repos: Optional[List[Dict[str, Any]]] = None) -> bool:
         """生成单个分类的文档
         
         Args:
             category: 分类名称
+            repos: 该分类的仓库列表，为None时从数据文件加载
             
         Returns:
             是否生成成功
         """
         try:
             # 获取该分类的所有仓库
-            all_repos = self.data_manager.get_repositories_by_category(category)
+            all_repos = repos if repos is not None else self.data_manager.get_repositories_by_category(category)
             
             if not all_repos:
                 self.logger.warning(f"No repositories found for category: {category}")
                 return False
             
+            # 只取星数最高的若干项目，更新检查和文档生成共用同一结果
+            display_repos = heapq.nlargest(self.max_projects, all_repos,
+                                           key=lambda x: x.get('stargazers_count', 0))
+            
             # 检查文档是否需要更新
-            if not self._check_document_needs_update(category, all_repos):
+            if not self._check_document_needs_update(category, all_repos, display_repos):
                 self.logger.info(f"Skipping unchanged category document: {category}")
                 return True
             
-            # 按星数排序并限制数量
-            sorted_repos = sorted(all_repos, key=lambda x: x.get('stargazers_count', 0), reverse=True)
-            display_repos = sorted_repos[:self.max_projects]
-            
             # 生成文档内容
-            content = self._generate_category_header(category, display_repos, len(all_repos))
-            content += self._generate_category_toc(display_repos)
-            content += "## 项目列表\n\n"
-            
-            for repo in display_repos:
-                content += self._format_repo_entry(repo)
+            summary = _CategorySummary(category, len(all_repos), len(display_repos))
+            parts = [
+                self._generate_category_header(summary),
+                self._generate_category_toc(display_repos),
+                _LIST_HEADER
+            ]
+            parts.extend(self._format_repo_entry(repo) for repo in display_repos)
             
             # 添加页脚
-            content += self._generate_footer(category, len(all_repos), len(display_repos))
+            parts.append(self._generate_footer(summary))
+            content = "".join(parts)
+            
+            # 保存文档，除时间戳外内容未变化时不重写文件
+            filepath = os.path.join(self.output_dir, self._category_filename(category))
+            content_hash = self._content_hash(content)
+            if self._is_unchanged(category, filepath, content_hash):
+                self.logger.info(f"Category document content unchanged, skipping write: {filepath}")
+                return True
             
-            # 保存文档
-            filename = f"{category.replace('/', '_')}.md"
-            filepath = os.path.join(self.output_dir, filename)
+            write_atomic(filepath, content.encode('utf-8'))
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self._update_manifest(category, {
+                'total': summary.total,
+                'displayed': self._displayed_summary(display_repos),
+                'hash': content_hash
+            })
             
             self.logger.info(f"Generated category document: {filepath}")
             return True
@@ -271,31 +556,29 @@ class CategoryDocGenerator:
             self.logger.error(f"Error generating category document for {category}: {e}")
             return False
     
-    def _generate_footer(self, category: str, total_count: int, displayed_count: int) -> str:
+    def _generate_footer(self, summary: _CategorySummary) -> str:
         """生成文档页脚
         
         Args:
-            category: 分类名称
-            total_count: 总项目数
-            displayed_count: 显示的项目数
+            summary: 分类计数摘要
             
         Returns:
             页脚Markdown字符串
         """
-        footer = "## 统计信息\n\n"
-        footer += f"- **分类**: {category}\n"
-        footer += f"- **总项目数**: {total_count}\n"
-        footer += f"- **显示项目数**: {displayed_count}\n"
+        parts = [
+            "## 统计信息\n\n",
+            f"- **分类**: {summary.name}\n",
+            f"- **总项目数**: {summary.total}\n",
+            f"- **显示项目数**: {summary.displayed}\n"
+        ]
         
-        if displayed_count < total_count:
-            footer += f"- **未显示项目数**: {total_count - displayed_count}\n"
+        if summary.displayed < summary.total:
+            parts.append(f"- **未显示项目数**: {summary.total - summary.displayed}\n")
         
-        footer += f"- **生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        parts.append(f"- **生成时间**: {self.generated_at}\n\n")
+        parts.append(_DOC_FOOTER_TAIL)
         
-        footer += "---\n\n"
-        footer += "*本文档由 [GitHub Star Manager](https://github.com/your-username/github-star-manager) 自动生成*\n"
-        
-        return footer
+        return "".join(parts)
     
     def generate_all_category_documents(self) -> Dict[str, bool]:
         """生成所有分类的文档
@@ -306,19 +589,33 @@ class CategoryDocGenerator:
         results = {}
         
         # 获取所有分类
-        data = self.data_manager.load_data()
-        stats = self.data_manager.get_statistics(data)
+        data, stats = self._get_data_and_stats()
         categories = stats.get('categories', {})
+        # 一次分组，避免每个分类重新加载数据文件
+        category_index = self._build_category_index(data)
+        # 清单缺失时（如首次运行）先并发解析现有文档，补全清单
+        self._prime_manifest_from_disk([category for category, count in categories.items() if count > 0])
         
         self.logger.info(f"Generating documents for {len(categories)} categories")
         
+        # 各分类文档相互独立，并发生成和写入
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                category: executor.submit(self.generate_category_document, category,
+                                          category_index.get(category, []))
+                for category, count in categories.items()
+                if count > 0  # 只为有项目的分类生成文档
+            }
+        
         for category in categories.keys():
-            if categories[category] > 0:  # 只为有项目的分类生成文档
-                results[category] = self.generate_category_document(category)
+            if category in futures:
+                results[category] = futures[category].result()
             else:
                 self.logger.info(f"Skipping empty category: {category}")
                 results[category] = False
         
+        self._save_manifest()
+        
         successful_count = sum(1 for success in results.values() if success)
         self.logger.info(f"Generated {successful_count}/{len(results)} category documents")
         
@@ -340,15 +637,37 @@ class CategoryDocGenerator:
             self.logger.info(f"Index document does not exist, creating new: {index_path}")
             return True
         
+        # 优先与清单中记录的摘要比较
+        entry = self._load_manifest().get('__index__')
+        if entry is not None:
+            basic_stats = stats['basic']
+            if (entry.get('total_repositories') != basic_stats['total_repositories']
+                    or entry.get('categories') != stats.get('categories', {})):
+                self.logger.info("Category statistics changed for index document")
+                return True
+            
+            old_rate = entry.get('classification_rate', 0.0)
+            new_rate = basic_stats['classification_rate']
+            if abs(old_rate - new_rate) > 0.1:  # 允许0.1%的误差
+                self.logger.info(f"Classification rate changed: {old_rate}%->{new_rate}%")
+                return True
+            
+            self.logger.info("No changes detected for index document")
+            return False
+        
+        # 清单中没有记录时（如首次运行），索引比数据文件新则无需检查内容
+        if self._is_newer_than_data(index_path):
+            self.logger.info("Index document is newer than data file, skipping check")
+            return False
+        
+        # 否则回退到解析现有文档
         try:
             # 读取现有索引文档
-            with open(index_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with open(index_path, 'rb') as f:
+                content = f.read().decode('utf-8')
             
             # 检查分类数量和项目总数是否变化
-            import re
-            stats_pattern = re.compile(r'总共有 \*\*(\d+)\*\* 个分类，包含 \*\*(\d+)\*\* 个项目')
-            match = stats_pattern.search(content)
+            match = _STATS_RE.search(content)
             if not match:
                 return True
             
@@ -363,8 +682,7 @@ class CategoryDocGenerator:
                 return True
             
             # 检查分类列表是否变化
-            category_pattern = re.compile(r'\| ([^|]+) \| (\d+) \|')
-            category_matches = category_pattern.findall(content)
+            category_matches = _CATEGORY_ROW_RE.findall(content)
             
             if len(category_matches) != new_category_count:
                 self.logger.info(f"Category count mismatch in index: {len(category_matches)} vs {new_category_count}")
@@ -382,8 +700,7 @@ class CategoryDocGenerator:
                     return True
             
             # 检查分类完成率是否变化
-            completion_pattern = re.compile(r'\*\*分类完成率\*\*: ([\d\.]+)%')
-            completion_match = completion_pattern.search(content)
+            completion_match = _COMPLETION_RE.search(content)
             if completion_match:
                 old_rate = float(completion_match.group(1))
                 new_rate = stats['basic']['classification_rate']
@@ -406,8 +723,7 @@ class CategoryDocGenerator:
             是否生成成功
         """
         try:
-            data = self.data_manager.load_data()
-            stats = self.data_manager.get_statistics(data)
+            _, stats = self._get_data_and_stats()
             
             # 检查索引是否需要更新
             if not self._check_index_needs_update(stats):
@@ -417,48 +733,61 @@ class CategoryDocGenerator:
             categories = stats.get('categories', {})
             
             # 生成索引内容
-            content = "# 项目分类索引\n\n"
-            content += f"总共有 **{len(categories)}** 个分类，包含 **{stats['basic']['total_repositories']}** 个项目。\n\n"
-            content += f"*最后更新时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n\n"
+            parts = [
+                "# 项目分类索引\n\n",
+                f"总共有 **{len(categories)}** 个分类，包含 **{stats['basic']['total_repositories']}** 个项目。\n\n",
+                f"*最后更新时间: {self.generated_at}*\n\n"
+            ]
             
-            # 按项目数量排序
-            sorted_categories = sorted(categories.items(), key=lambda x: x[1], reverse=True)
+            # 过滤掉空分类后按项目数量排序
+            sorted_categories = sorted(
+                (item for item in categories.items() if item[1] > 0),
+                key=itemgetter(1), reverse=True
+            )
             
-            content += "## 分类列表\n\n"
-            content += "| 分类 | 项目数量 | 文档链接 |\n"
-            content += "|------|----------|----------|\n"
+            parts.append(_INDEX_TABLE_HEADER)
             
             for category, count in sorted_categories:
-                if count > 0:
-                    filename = f"{category.replace('/', '_')}.md"
-                    content += f"| {category} | {count} | [{category}]({filename}) |\n"
+                filename = self._category_filename(category)
+                parts.append(f"| {category} | {count} | [{category}]({filename}) |\n")
             
-            content += "\n"
+            parts.append("\n")
             
             # 添加统计信息
-            content += "## 统计概览\n\n"
             basic_stats = stats['basic']
-            content += f"- **总项目数**: {basic_stats['total_repositories']}\n"
-            content += f"- **已分类项目**: {basic_stats['classified_repositories']}\n"
-            content += f"- **未分类项目**: {basic_stats['unclassified_repositories']}\n"
-            content += f"- **分类完成率**: {basic_stats['classification_rate']:.1f}%\n\n"
+            parts.append("## 统计概览\n\n")
+            parts.append(f"- **总项目数**: {basic_stats['total_repositories']}\n")
+            parts.append(f"- **已分类项目**: {basic_stats['classified_repositories']}\n")
+            parts.append(f"- **未分类项目**: {basic_stats['unclassified_repositories']}\n")
+            parts.append(f"- **分类完成率**: {basic_stats['classification_rate']:.1f}%\n\n")
             
             # 添加语言统计
             languages = stats.get('languages', {})
             if languages:
-                content += "## 主要编程语言\n\n"
-                content += "| 语言 | 项目数量 |\n"
-                content += "|------|----------|\n"
+                parts.append(_LANGUAGE_TABLE_HEADER)
                 
                 for language, count in list(languages.items())[:10]:
-                    content += f"| {language} | {count} |\n"
+                    parts.append(f"| {language} | {count} |\n")
                 
-                content += "\n"
+                parts.append("\n")
             
-            # 保存索引文档
+            # 保存索引文档，除时间戳外内容未变化时不重写文件
             index_path = os.path.join(self.output_dir, "index.md")
-            with open(index_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            content = "".join(parts)
+            content_hash = self._content_hash(content)
+            if self._is_unchanged('__index__', index_path, content_hash):
+                self.logger.info(f"Category index content unchanged, skipping write: {index_path}")
+                return True
+            
+            write_atomic(index_path, content.encode('utf-8'))
+            
+            self._update_manifest('__index__', {
+                'total_repositories': basic_stats['total_repositories'],
+                'categories': categories,
+                'classification_rate': basic_stats['classification_rate'],
+                'hash': content_hash
+            })
+            self._save_manifest()
             
             self.logger.info(f"Generated category index: {index_path}")
             return True
@@ -474,19 +803,22 @@ class CategoryDocGenerator:
                 return
             
             # 获取当前所有分类
-            data = self.data_manager.load_data()
-            stats = self.data_manager.get_statistics(data)
-            current_categories = set(stats.get('categories', {}).keys())
-            
-            # 检查现有文档文件
-            for filename in os.listdir(self.output_dir):
-                if filename.endswith('.md') and filename != 'index.md':
-                    category = filename[:-3].replace('_', '/')
-                    
-                    if category not in current_categories:
-                        file_path = os.path.join(self.output_dir, filename)
-                        os.remove(file_path)
-                        self.logger.info(f"Removed obsolete document: {file_path}")
+            _, stats = self._get_data_and_stats()
+            current_categories = frozenset(stats.get('categories', {}))
+            
+            # 检查现有文档文件，DirEntry自带完整路径，无需再拼接
+            with os.scandir(self.output_dir) as entries:
+                for entry in entries:
+                    filename = entry.name
+                    if entry.is_file() and filename.endswith('.md') and filename != 'index.md':
+                        category = filename[:-3].replace('_', '/')
+                        
+                        if category not in current_categories:
+                            os.remove(entry.path)
+                            self._update_manifest(category, None)
+                            self.logger.info(f"Removed obsolete document: {entry.path}")
+            
+            self._save_manifest()
                         
         except Exception as e:
             self.logger.error(f"Error cleaning old documents: {e}")
@@ -505,6 +837,7 @@ def main():
         # 生成所有文档的命令
         all_parser = subparsers.add_parser('all', help='生成所有分类文档')
         all_parser.add_argument('--force', action='store_true', help='强制全量更新所有文档')
+        all_parser.add_argument('--serial', action='store_true', help='逐个生成分类文档，便于调试')
         
         # 生成单个分类文档的命令
         category_parser = subparsers.add_parser('category', help='生成指定分类的文档')
@@ -532,15 +865,18 @@ def main():
         if args.command == 'category':
             # 如果指定了强制更新，临时修改检查方法
             if args.force:
-                generator._check_document_needs_update = lambda category, repos: True
+                generator.force = True
+                generator._check_document_needs_update = lambda category, repos, display_repos: True
             
             # 生成指定分类的文档
             success = generator.generate_category_document(args.name)
+            generator._save_manifest()
             print(f"Category document generation {'successful' if success else 'failed'}")
             
         elif args.command == 'index':
             # 如果指定了强制更新，临时修改检查方法
             if args.force:
+                generator.force = True
                 generator._check_index_needs_update = lambda stats: True
             
             # 生成索引文档
@@ -555,10 +891,14 @@ def main():
         else:  # 'all' 命令或默认情况
             # 如果指定了强制更新，临时修改检查方法
             if hasattr(args, 'force') and args.force:
-                generator._check_document_needs_update = lambda category, repos: True
+                generator.force = True
+                generator._check_document_needs_update = lambda category, repos, display_repos: True
                 generator._check_index_needs_update = lambda stats: True
                 print("Forcing full update of all documents")
             
+            if getattr(args, 'serial', False):
+                generator.max_workers = 1
+            
             # 生成所有文档
             results = generator.generate_all_category_documents()
             generator.generate_category_index()
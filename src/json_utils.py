@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GitHub Star Manager - JSON序列化模块
+
+功能：
+- 统一JSON的解析和序列化，供各模块共享
+- 安装了orjson时优先使用，未安装时回退到标准库json
+- orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，调用方统一捕获后者即可
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data: Union[bytes, memoryview]) -> Any:
+    """解析JSON字节串，安装了orjson时直接解析字节，省去UTF-8解码
+
+    Args:
+        data: UTF-8编码的JSON字节串，或指向其内容的memoryview
+
+    Returns:
+        解析结果
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """序列化为UTF-8编码的JSON字节串，安装了orjson时优先使用
+
+    两种实现的输出一致：不转义非ASCII字符，缩进时使用2个空格。
+
+    Args:
+        obj: 待序列化对象
+        indent: 是否使用2空格缩进
+
+    Returns:
+        JSON字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
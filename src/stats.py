@@ -5,10 +5,19 @@
 用于生成项目统计信息和执行摘要
 """
 
-import json
+import mmap
 import os
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple
+from .json_utils import json_loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# 超过该大小的数据文件使用ijson流式统计，避免一次性载入内存
+STREAM_THRESHOLD = 10 * 1024 * 1024
 
 
 class StatsReporter:
@@ -16,6 +25,77 @@ class StatsReporter:
     
     def __init__(self, data_file: str = "data/stars_data.json"):
         self.data_file = data_file
+        # 已解析的数据文件及其修改时间，文件未变化时直接复用
+        self._cache: Optional[Dict[str, Any]] = None
+        self._cache_mtime: Optional[int] = None
+        # 统计摘要 (总数, 已分类数, 最后更新时间) 及其对应的修改时间
+        self._summary: Optional[Tuple[int, int, Any]] = None
+        self._summary_mtime: Optional[int] = None
+    
+    def _load_json(self) -> Dict[str, Any]:
+        """读取数据文件，按修改时间缓存解析结果"""
+        mtime = os.stat(self.data_file).st_mtime_ns
+        if self._cache is None or self._cache_mtime != mtime:
+            # 通过mmap直接解析页缓存中的内容，安装了orjson时不再复制出一份完整的bytes
+            with open(self.data_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    self._cache = json_loads(b'')
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m, memoryview(m) as view:
+                        self._cache = json_loads(view)
+            self._cache_mtime = mtime
+        return self._cache
+    
+    @staticmethod
+    def _count_repos(repos: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """单次遍历统计项目总数和已分类数
+        
+        Returns:
+            (总数, 已分类数) 元组
+        """
+        total = 0
+        classified = 0
+        for repo in repos:
+            total += 1
+            if repo.get('is_classified', False):
+                classified += 1
+        return total, classified
+    
+    def _stream_summary(self) -> Tuple[int, int, Any]:
+        """使用ijson流式遍历数据文件，逐项累计统计信息
+        
+        Returns:
+            (总数, 已分类数, 最后更新时间) 元组
+        """
+        total = 0
+        classified = 0
+        last_updated = 'Unknown'
+        with open(self.data_file, 'rb') as f:
+            for prefix, event, value in ijson.parse(f):
+                if prefix == 'repositories.item' and event == 'start_map':
+                    total += 1
+                elif prefix == 'repositories.item.is_classified' and value:
+                    classified += 1
+                elif prefix == 'metadata.last_updated':
+                    last_updated = value
+        return total, classified, last_updated
+    
+    def get_summary(self) -> Tuple[int, int, Any]:
+        """获取统计摘要，按修改时间缓存；大文件且安装了ijson时流式统计
+        
+        Returns:
+            (总数, 已分类数, 最后更新时间) 元组
+        """
+        file_stat = os.stat(self.data_file)
+        if self._summary is None or self._summary_mtime != file_stat.st_mtime_ns:
+            if ijson is not None and file_stat.st_size > STREAM_THRESHOLD:
+                self._summary = self._stream_summary()
+            else:
+                data = self._load_json()
+                total, classified = self._count_repos(data.get('repositories', []))
+                self._summary = (total, classified, data.get('metadata', {}).get('last_updated', 'Unknown'))
+            self._summary_mtime = file_stat.st_mtime_ns
+        return self._summary
     
     def get_project_stats(self) -> Dict[str, Any]:
         """获取项目统计信息"""
@@ -33,13 +113,10 @@ class StatsReporter:
             if os.path.exists(self.data_file):
                 stats['file_exists'] = True
                 
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                repos = data.get('repositories', [])
-                stats['total_projects'] = len(repos)
-                stats['classified_projects'] = sum(1 for r in repos if r.get('is_classified', False))
-                stats['unclassified_projects'] = stats['total_projects'] - stats['classified_projects']
+                total, classified, last_updated = self.get_summary()
+                stats['total_projects'] = total
+                stats['classified_projects'] = classified
+                stats['unclassified_projects'] = total - classified
                 
                 if stats['total_projects'] > 0:
                     stats['classification_rate'] = (stats['classified_projects'] / stats['total_projects']) * 100
@@ -49,7 +126,7 @@ class StatsReporter:
                 stats['file_size_kb'] = file_size / 1024
                 
                 # 最后更新时间
-                stats['last_updated'] = data.get('metadata', {}).get('last_updated', 'Unknown')
+                stats['last_updated'] = last_updated
                 
         except Exception as e:
             print(f"获取统计信息时出错: {e}")
@@ -60,11 +137,8 @@ class StatsReporter:
         """获取未分类项目数量"""
         try:
             if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                repos = data.get('repositories', [])
-                return sum(1 for r in repos if not r.get('is_classified', False))
+                total, classified, _ = self.get_summary()
+                return total - classified
         except Exception:
             pass
         
@@ -83,10 +157,15 @@ class StatsReporter:
                 stats['docs_exist'] = True
                 doc_files = []
                 
-                for root, dirs, files in os.walk(docs_dir):
-                    for file in files:
-                        if file.endswith('.md'):
-                            doc_files.append(file)
+                # 使用scandir逐层遍历，DirEntry缓存了文件类型，无需额外stat
+                pending_dirs = [docs_dir]
+                while pending_dirs:
+                    with os.scandir(pending_dirs.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending_dirs.append(entry.path)
+                            elif entry.name.endswith('.md'):
+                                doc_files.append(entry.name)
                 
                 stats['doc_count'] = len(doc_files)
                 stats['doc_files'] = sorted(doc_files)
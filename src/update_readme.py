@@ -12,11 +12,23 @@ GitHub Star Manager - README更新模块
 
 import os
 import re
+import heapq
+import shutil
 import logging
 from datetime import datetime
-from typing import Dict, Any, List, Tuple
-import yaml
+from operator import itemgetter
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+from .config import load_config
 from .data_manager import DataManager
+from .file_utils import write_atomic
+
+# README中自动生成部分的起止标记
+_START_MARKER = "<!-- GITHUB_STAR_MANAGER_START -->"
+_END_MARKER = "<!-- GITHUB_STAR_MANAGER_END -->"
+# 匹配起止标记之间（含标记）的内容，模块加载时编译一次
+_SECTION_RE = re.compile(f"{re.escape(_START_MARKER)}.*?{re.escape(_END_MARKER)}", re.DOTALL)
+# 比较内容是否变化时忽略的时间戳行
+_TIMESTAMP_RE = re.compile(r'^- \*\*最后更新时间\*\*: .*$', re.MULTILINE)
 
 
 class ReadmeUpdater:
@@ -33,12 +45,17 @@ class ReadmeUpdater:
         self.readme_path = self.config['docs']['readme_file']
         self.docs_dir = self.config['docs']['output_dir']
         self.logger = self._setup_logger()
+        # 本次运行使用统一的时间戳
+        self.generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # 数据及统计信息缓存，按数据文件修改时间失效
+        self._data_cache: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None
+        self._data_cache_key: Optional[Tuple[int, int]] = None
         
         # 标记注释
-        self.start_marker = "<!-- GITHUB_STAR_MANAGER_START -->"
-        self.end_marker = "<!-- GITHUB_STAR_MANAGER_END -->"
+        self.start_marker = _START_MARKER
+        self.end_marker = _END_MARKER
         
-    def _load_config(self, config_path: str) -> Dict[str, Any]:
+    def _load_config(self, config_path: str) -> Mapping[str, Any]:
         """加载配置文件
         
         Args:
@@ -47,13 +64,7 @@ class ReadmeUpdater:
         Returns:
             配置字典
         """
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Configuration file not found: {config_path}")
-        except yaml.YAMLError as e:
-            raise ValueError(f"Invalid YAML configuration: {e}")
+        return load_config(config_path)
     
     def _setup_logger(self) -> logging.Logger:
         """设置日志记录器
@@ -176,6 +187,24 @@ MIT License
 """
         return template
     
+    def _get_data_and_stats(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """加载数据及统计信息，数据文件未变化时复用上次结果
+        
+        Returns:
+            (数据字典, 统计信息) 元组
+        """
+        try:
+            file_stat = os.stat(self.data_manager.data_file)
+            cache_key = (file_stat.st_mtime_ns, file_stat.st_size)
+        except OSError:
+            cache_key = None
+        
+        if self._data_cache is None or cache_key is None or cache_key != self._data_cache_key:
+            data = self.data_manager.load_data()
+            self._data_cache = (data, self.data_manager.get_statistics(data))
+            self._data_cache_key = cache_key
+        return self._data_cache
+    
     def _generate_statistics_section(self) -> str:
         """生成统计信息部分
         
@@ -183,85 +212,99 @@ MIT License
             统计信息的Markdown内容
         """
         try:
-            data = self.data_manager.load_data()
-            stats = self.data_manager.get_statistics(data)
+            data, stats = self._get_data_and_stats()
             
-            content = "### 📊 项目统计\n\n"
+            parts = ["### 📊 项目统计\n\n"]
             
             # 基础统计
             basic_stats = stats['basic']
-            content += f"- **总项目数**: {basic_stats['total_repositories']:,}\n"
-            content += f"- **已分类项目**: {basic_stats['classified_repositories']:,}\n"
-            content += f"- **未分类项目**: {basic_stats['unclassified_repositories']:,}\n"
-            content += f"- **分类完成率**: {basic_stats['classification_rate']:.1f}%\n\n"
+            parts.append(f"- **总项目数**: {basic_stats['total_repositories']:,}\n")
+            parts.append(f"- **已分类项目**: {basic_stats['classified_repositories']:,}\n")
+            parts.append(f"- **未分类项目**: {basic_stats['unclassified_repositories']:,}\n")
+            parts.append(f"- **分类完成率**: {basic_stats['classification_rate']:.1f}%\n\n")
+            
+            # 文档目录只列出一次，分类链接和索引链接共用
+            existing_docs = self._list_docs()
             
             # 分类统计
             categories = stats.get('categories', {})
             if categories:
-                content += "### 📂 分类概览\n\n"
-                content += "| 分类 | 项目数量 | 文档链接 |\n"
-                content += "|------|----------|----------|\n"
+                parts.append("### 📂 分类概览\n\n")
+                parts.append("| 分类 | 项目数量 | 文档链接 |\n")
+                parts.append("|------|----------|----------|\n")
                 
-                # 按项目数量排序
-                sorted_categories = sorted(categories.items(), key=lambda x: x[1], reverse=True)
+                # 过滤掉空分类后按项目数量排序
+                sorted_categories = sorted(
+                    (item for item in categories.items() if item[1] > 0),
+                    key=itemgetter(1), reverse=True
+                )
                 
                 for category, count in sorted_categories:
-                    if count > 0:
-                        # 生成文档链接
-                        doc_filename = f"{category.replace('/', '_')}.md"
-                        doc_path = f"{self.docs_dir}/{doc_filename}"
-                        
-                        if os.path.exists(doc_path):
-                            link = f"[📖 查看详情]({self.docs_dir}/{doc_filename})"
-                        else:
-                            link = "文档生成中..."
-                        
-                        content += f"| {category} | {count:,} | {link} |\n"
+                    # 生成文档链接
+                    doc_filename = f"{category.replace('/', '_')}.md"
+                    
+                    if doc_filename in existing_docs:
+                        link = f"[📖 查看详情]({self.docs_dir}/{doc_filename})"
+                    else:
+                        link = "文档生成中..."
+                    
+                    parts.append(f"| {category} | {count:,} | {link} |\n")
                 
-                content += "\n"
+                parts.append("\n")
             
             # 语言统计（显示前10个）
             languages = stats.get('languages', {})
             if languages:
-                content += "### 💻 主要编程语言\n\n"
-                content += "| 语言 | 项目数量 | 占比 |\n"
-                content += "|------|----------|------|\n"
+                parts.append("### 💻 主要编程语言\n\n")
+                parts.append("| 语言 | 项目数量 | 占比 |\n")
+                parts.append("|------|----------|------|\n")
                 
                 total_repos = basic_stats['total_repositories']
                 top_languages = list(languages.items())[:10]
                 
                 for language, count in top_languages:
                     percentage = (count / total_repos * 100) if total_repos > 0 else 0
-                    content += f"| {language} | {count:,} | {percentage:.1f}% |\n"
+                    parts.append(f"| {language} | {count:,} | {percentage:.1f}% |\n")
                 
-                content += "\n"
+                parts.append("\n")
             
             # 最近更新信息
-            content += "### 🕒 更新信息\n\n"
-            content += f"- **最后更新时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            parts.append("### 🕒 更新信息\n\n")
+            parts.append(f"- **最后更新时间**: {self.generated_at}\n")
             
             # 获取最近添加的项目
             recent_repos = self._get_recent_repositories(data, limit=5)
             if recent_repos:
-                content += "- **最近添加的项目**:\n"
+                parts.append("- **最近添加的项目**:\n")
                 for repo in recent_repos:
                     name = repo.get('name', '')
                     url = repo.get('html_url', '')
-                    content += f"  - [{name}]({url})\n"
+                    parts.append(f"  - [{name}]({url})\n")
             
-            content += "\n"
+            parts.append("\n")
             
             # 添加索引链接
-            index_path = os.path.join(self.docs_dir, "index.md")
-            if os.path.exists(index_path):
-                content += f"📋 [查看完整分类索引]({self.docs_dir}/index.md)\n\n"
+            if "index.md" in existing_docs:
+                parts.append(f"📋 [查看完整分类索引]({self.docs_dir}/index.md)\n\n")
             
-            return content
+            return "".join(parts)
             
         except Exception as e:
             self.logger.error(f"Error generating statistics section: {e}")
             return "### 📊 项目统计\n\n统计信息生成失败，请检查数据文件。\n\n"
     
+    def _list_docs(self) -> frozenset:
+        """一次列出文档目录中的文件名，避免逐个分类检查文件是否存在
+        
+        Returns:
+            文档文件名集合，目录不存在时为空集合
+        """
+        try:
+            with os.scandir(self.docs_dir) as entries:
+                return frozenset(entry.name for entry in entries if entry.is_file())
+        except OSError:
+            return frozenset()
+    
     def _get_recent_repositories(self, data: Dict[str, Any], limit: int = 5) -> List[Dict[str, Any]]:
         """获取最近添加的仓库
         
@@ -275,36 +318,17 @@ MIT License
         try:
             repositories = data.get('repositories', [])
             
-            # 按starred_at时间排序（如果有的话）
-            sorted_repos = sorted(
+            # 按starred_at时间（如果有的话）取最近的若干项目，无需整体排序
+            return heapq.nlargest(
+                limit,
                 repositories,
-                key=lambda x: x.get('starred_at', x.get('created_at', '')),
-                reverse=True
+                key=lambda x: x.get('starred_at', x.get('created_at', ''))
             )
             
-            return sorted_repos[:limit]
-            
         except Exception as e:
             self.logger.error(f"Error getting recent repositories: {e}")
             return []
     
-    def _find_update_section(self, content: str) -> Tuple[int, int]:
-        """查找需要更新的部分
-        
-        Args:
-            content: README内容
-            
-        Returns:
-            (开始位置, 结束位置) 的元组，如果未找到返回 (-1, -1)
-        """
-        start_pos = content.find(self.start_marker)
-        end_pos = content.find(self.end_marker)
-        
-        if start_pos != -1 and end_pos != -1 and end_pos > start_pos:
-            return start_pos, end_pos + len(self.end_marker)
-        
-        return -1, -1
-    
     def update_readme(self) -> bool:
         """更新README文件
         
@@ -319,35 +343,34 @@ MIT License
             stats_section = self._generate_statistics_section()
             
             # 构建完整的更新内容
-            update_content = f"{self.start_marker}\n"
-            update_content += "<!-- 此部分内容由GitHub Star Manager自动生成和更新 -->\n\n"
-            update_content += stats_section
-            update_content += self.end_marker
-            
-            # 查找现有的更新部分
-            start_pos, end_pos = self._find_update_section(current_content)
-            
-            if start_pos != -1 and end_pos != -1:
-                # 替换现有内容
-                new_content = (
-                    current_content[:start_pos] +
-                    update_content +
-                    current_content[end_pos:]
-                )
-            else:
+            update_content = "".join([
+                f"{self.start_marker}\n",
+                "<!-- 此部分内容由GitHub Star Manager自动生成和更新 -->\n\n",
+                stats_section,
+                self.end_marker
+            ])
+            
+            # 单次扫描替换现有的更新部分
+            new_content, replaced = _SECTION_RE.subn(lambda _: update_content, current_content, count=1)
+            
+            if not replaced:
                 # 如果没有找到标记，在文件末尾添加
                 if not current_content.endswith('\n'):
                     current_content += '\n'
                 new_content = current_content + '\n' + update_content + '\n'
             
+            # 除时间戳外内容未变化时不重写文件
+            if _TIMESTAMP_RE.sub('', new_content) == _TIMESTAMP_RE.sub('', current_content):
+                self.logger.info(f"README content unchanged, skipping write: {self.readme_path}")
+                return True
+            
             # 确保目录存在
             readme_dir = os.path.dirname(self.readme_path)
             if readme_dir:
                 os.makedirs(readme_dir, exist_ok=True)
             
-            # 写入更新后的内容
-            with open(self.readme_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            # 一次编码后原子写入，中途失败不会留下不完整的README
+            write_atomic(self.readme_path, new_content.encode('utf-8'))
             
             self.logger.info(f"Successfully updated README: {self.readme_path}")
             return True
@@ -371,33 +394,30 @@ MIT License
         }
         
         try:
-            if os.path.exists(self.readme_path):
-                result['exists'] = True
-                
-                # 获取文件信息
-                stat = os.stat(self.readme_path)
-                result['last_modified'] = datetime.fromtimestamp(stat.st_mtime)
-                
-                # 读取内容
-                content = self._read_readme()
-                result['content_length'] = len(content)
-                
-                # 检查标记
-                if self.start_marker in content and self.end_marker in content:
-                    result['has_markers'] = True
-                else:
-                    result['issues'].append("Missing update markers")
-                
-                # 检查基本结构
-                if '# ' not in content:
-                    result['issues'].append("No main heading found")
-                
-                if len(content.strip()) < 100:
-                    result['issues'].append("Content seems too short")
-                    
+            # 打开一次文件，同时获取文件信息和内容
+            with open(self.readme_path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                content = f.read().decode('utf-8')
+            
+            result['exists'] = True
+            result['last_modified'] = datetime.fromtimestamp(stat.st_mtime)
+            result['content_length'] = len(content)
+            
+            # 检查标记
+            if self.start_marker in content and self.end_marker in content:
+                result['has_markers'] = True
             else:
-                result['issues'].append("README file does not exist")
+                result['issues'].append("Missing update markers")
+            
+            # 检查基本结构
+            if '# ' not in content:
+                result['issues'].append("No main heading found")
+            
+            if len(content.strip()) < 100:
+                result['issues'].append("Content seems too short")
                 
+        except FileNotFoundError:
+            result['issues'].append("README file does not exist")
         except Exception as e:
             result['issues'].append(f"Error validating README: {e}")
             
@@ -418,12 +438,8 @@ MIT License
             backup_filename = f"README_backup_{timestamp}.md"
             backup_path = os.path.join(os.path.dirname(self.readme_path), backup_filename)
             
-            # 复制文件
-            with open(self.readme_path, 'r', encoding='utf-8') as src:
-                content = src.read()
-            
-            with open(backup_path, 'w', encoding='utf-8') as dst:
-                dst.write(content)
+            # 复制文件，由内核完成拷贝
+            shutil.copyfile(self.readme_path, backup_path)
             
             self.logger.info(f"README backed up to: {backup_path}")
             return backup_path